@@ -2,12 +2,17 @@
 """
 Скрипт для проверки состояния развертывания системы.
 Показывает статистику по созданным данным.
+В режиме --json собирает все показатели одним запросом и выводит
+машиночитаемый снимок для readiness-проб.
 """
 
+import argparse
 import asyncio
+import json
 import sys
 import os
-from sqlalchemy import select, func
+import time
+from sqlalchemy import JSON, select, func, literal_column
 
 # Добавляем корневую директорию проекта в путь, чтобы работали импорты
 sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'RentalApp_FASTAPI'))
@@ -18,8 +23,8 @@ from api.models.equipment import Equipment
 from api.models.brand_system import BrandSystem
 from api.models.accessory import Accessory
 
-async def check_deployment_status():
-    """Проверяет состояние развертывания системы."""
+async def check_deployment_status() -> bool:
+    """Проверяет состояние развертывания системы. Возвращает готовность системы."""
     print("🔍 Проверка состояния развертывания системы...")
     print("=" * 60)
     
@@ -87,7 +92,8 @@ async def check_deployment_status():
         print(f"  🎒 Аксессуары: {accessory_count}")
         
         # Проверяем готовность системы
-        if len(admins) > 0 and equipment_count > 0:
+        ready = len(admins) > 0 and equipment_count > 0
+        if ready:
             print(f"\n✅ СИСТЕМА ГОТОВА К ИСПОЛЬЗОВАНИЮ!")
             print(f"🔑 Для входа используйте данные администратора выше")
         else:
@@ -96,11 +102,97 @@ async def check_deployment_status():
                 print(f"❌ Отсутствует администратор - запустите create_admin.py")
             if equipment_count == 0:
                 print(f"❌ Отсутствует оборудование - запустите seed_equipment_data.py")
-        
+
+        return ready
+
     except Exception as e:
         print(f"❌ Ошибка при проверке: {e}")
+        raise
+    finally:
+        await db_session.close()
+
+def _count_by_type_json(type_column, id_column):
+    """Скалярный подзапрос: JSON-объект {тип: количество} для группировки по типу."""
+    grouped = (
+        select(func.coalesce(type_column, "").label("type"), func.count(id_column).label("count"))
+        .group_by(type_column)
+        .subquery()
+    )
+    return (
+        select(func.coalesce(func.json_object_agg(grouped.c.type, grouped.c.count),
+                             literal_column("'{}'::json"), type_=JSON))
+        .scalar_subquery()
+    )
+
+
+def build_snapshot_query():
+    """Собирает все показатели развертывания в один запрос без загрузки ORM-объектов."""
+    return select(
+        select(func.count(User.id)).where(User.role == "admin")
+        .scalar_subquery().label("admins"),
+        select(func.count(User.id)).where(User.role == "admin", User.is_active.is_(True))
+        .scalar_subquery().label("active_admins"),
+        select(func.count(Equipment.id)).scalar_subquery().label("equipment"),
+        select(func.count(BrandSystem.id)).scalar_subquery().label("brand_systems"),
+        select(func.count(Accessory.id)).scalar_subquery().label("accessories"),
+        _count_by_type_json(Equipment.equipment_type, Equipment.id).label("equipment_by_type"),
+        _count_by_type_json(Accessory.accessory_type, Accessory.id).label("accessories_by_type"),
+    )
+
+
+async def get_deployment_snapshot() -> dict:
+    """Возвращает снимок состояния развертывания с задержками выполнения."""
+    started = time.perf_counter()
+    db_session = AsyncSessionLocal()
+    try:
+        query_started = time.perf_counter()
+        result = await db_session.execute(build_snapshot_query())
+        row = result.mappings().one()
+        query_ms = (time.perf_counter() - query_started) * 1000
     finally:
         await db_session.close()
 
+    return {
+        "ready": row["admins"] > 0 and row["equipment"] > 0,
+        "counts": {
+            "admins": row["admins"],
+            "active_admins": row["active_admins"],
+            "equipment": row["equipment"],
+            "brand_systems": row["brand_systems"],
+            "accessories": row["accessories"],
+        },
+        "equipment_by_type": row["equipment_by_type"],
+        "accessories_by_type": row["accessories_by_type"],
+        "latency_ms": {
+            "snapshot_query": round(query_ms, 3),
+            "total": round((time.perf_counter() - started) * 1000, 3),
+        },
+    }
+
+
+async def print_deployment_snapshot() -> bool:
+    """Выводит снимок состояния в формате JSON. Возвращает готовность системы."""
+    try:
+        snapshot = await get_deployment_snapshot()
+    except Exception as e:
+        snapshot = {"ready": False, "error": str(e)}
+    print(json.dumps(snapshot, ensure_ascii=False))
+    return snapshot["ready"]
+
+
+def parse_args():
+    """Разбирает аргументы командной строки."""
+    parser = argparse.ArgumentParser(description="Проверка состояния развертывания системы")
+    parser.add_argument("--json", action="store_true",
+                        help="вывести снимок состояния одним запросом в формате JSON "
+                             "(код возврата 0 - система готова, 1 - нет)")
+    return parser.parse_args()
+
+
 if __name__ == "__main__":
-    asyncio.run(check_deployment_status())
+    args = parse_args()
+    if args.json:
+        ready = asyncio.run(print_deployment_snapshot())
+    else:
+        ready = asyncio.run(check_deployment_status())
+    sys.exit(0 if ready else 1)
@@ -64,6 +64,7 @@ async def create_admin_user():
     except Exception as e:
         await db_session.rollback()
         print(f"❌ Произошла ошибка: {e}")
+        raise
     finally:
         await db_session.close()
         print("🏁 Скрипт завершил работу.")
@@ -1,83 +1,145 @@
 #!/usr/bin/env python3
 """
 Главный скрипт для полного развертывания и инициализации базы данных.
-Запускает все необходимые скрипты в правильном порядке.
+Выполняет все шаги развертывания в одном процессе: шаги образуют граф
+зависимостей, независимые шаги запускаются параллельно на общем пуле
+соединений, вывод идет в реальном времени с замером времени каждого шага.
 """
 
 import asyncio
 import sys
-import os
-import subprocess
-from pathlib import Path
+import time
+from typing import Any, Awaitable, Callable, Dict, List
 
-def run_script(script_path: str, description: str):
-    """Запускает Python скрипт и выводит результат."""
-    print(f"\n{'='*60}")
-    print(f"🚀 {description}")
-    print(f"{'='*60}")
-    
-    try:
-        # Запускаем скрипт
-        result = subprocess.run([
-            sys.executable, script_path
-        ], capture_output=True, text=True, cwd=os.path.dirname(os.path.abspath(__file__)))
-        
-        # Выводим результат
-        if result.stdout:
-            print(result.stdout)
-        if result.stderr:
-            print("STDERR:", result.stderr)
-        
-        if result.returncode == 0:
-            print(f"✅ {description} - УСПЕШНО")
-        else:
-            print(f"❌ {description} - ОШИБКА (код: {result.returncode})")
+from create_admin import create_admin_user, ADMIN_EMAIL, ADMIN_PASSWORD
+from seed_equipment_data import (
+    AsyncSessionLocal,
+    bulk_create_accessories,
+    bulk_create_brand_systems,
+    bulk_create_equipment,
+)
+from check_deployment import check_deployment_status
+
+
+def in_session(action: Callable[[Any], Awaitable[int]]) -> Callable[[], Awaitable[int]]:
+    """
+    Оборачивает шаг наполнения: отдельная сессия из общего пула и одна
+    транзакция на шаг. Возвращает количество созданных записей.
+    """
+    async def run() -> int:
+        db_session = AsyncSessionLocal()
+        try:
+            created = await action(db_session)
+            await db_session.commit()
+            return created
+        except Exception:
+            await db_session.rollback()
+            raise
+        finally:
+            await db_session.close()
+    return run
+
+
+async def verify_deployment():
+    """Проверка состояния развертывания: ошибка, если система не готова к использованию."""
+    if not await check_deployment_status():
+        raise RuntimeError("система не готова: отсутствует администратор или оборудование")
+
+
+# Шаги развертывания и их зависимости
+DEPLOY_STEPS = [
+    {
+        "name": "admin",
+        "description": "Создание администратора",
+        "action": create_admin_user,
+        "depends_on": []
+    },
+    {
+        "name": "brand_systems",
+        "description": "Создание систем брендов",
+        "action": in_session(bulk_create_brand_systems),
+        "depends_on": []
+    },
+    {
+        "name": "accessories",
+        "description": "Создание аксессуаров",
+        "action": in_session(bulk_create_accessories),
+        "depends_on": []
+    },
+    {
+        "name": "equipment",
+        "description": "Заполнение базы данных оборудованием",
+        "action": in_session(bulk_create_equipment),
+        "depends_on": ["brand_systems"]
+    },
+    {
+        "name": "verification",
+        "description": "Проверка состояния развертывания",
+        "action": verify_deployment,
+        "depends_on": ["admin", "brand_systems", "accessories", "equipment"]
+    }
+]
+
+
+async def run_steps(steps: List[Dict[str, Any]]) -> Dict[str, bool]:
+    """
+    Выполняет граф шагов: каждый шаг стартует сразу после успешного
+    завершения своих зависимостей. Возвращает результат по каждому шагу.
+    """
+    names = {step["name"] for step in steps}
+    for step in steps:
+        unknown = set(step["depends_on"]) - names
+        if unknown:
+            raise ValueError(f"Шаг '{step['name']}' зависит от неизвестных шагов: {', '.join(sorted(unknown))}")
+
+    tasks: Dict[str, asyncio.Task] = {}
+
+    async def run_step(step: Dict[str, Any]) -> bool:
+        dependencies = await asyncio.gather(*(tasks[name] for name in step["depends_on"]))
+        if not all(dependencies):
+            print(f"⏭️  {step['description']} - ПРОПУЩЕНО (не выполнены зависимости)")
             return False
-            
-    except Exception as e:
-        print(f"❌ Ошибка при запуске {description}: {e}")
-        return False
-    
-    return True
 
-def main():
+        print(f"🚀 {step['description']} - запуск")
+        started = time.perf_counter()
+        try:
+            created = await step["action"]()
+        except Exception as e:
+            print(f"❌ {step['description']} - ОШИБКА за {time.perf_counter() - started:.2f} с: {e}")
+            return False
+
+        # Шаги наполнения возвращают количество созданных записей
+        summary = f", создано записей: {created}" if created is not None else ""
+        print(f"✅ {step['description']} - УСПЕШНО за {time.perf_counter() - started:.2f} с{summary}")
+        return True
+
+    # Задачи создаются до первого await, поэтому зависимости всегда найдутся в tasks
+    for step in steps:
+        tasks[step["name"]] = asyncio.create_task(run_step(step))
+
+    results = await asyncio.gather(*tasks.values())
+    return dict(zip(tasks.keys(), results))
+
+
+async def deploy() -> bool:
     """Основная функция развертывания."""
     print("🎯 ПОЛНОЕ РАЗВЕРТЫВАНИЕ СИСТЕМЫ АРЕНДЫ ОБОРУДОВАНИЯ")
     print("=" * 60)
-    
-    # Получаем путь к папке deploy
-    deploy_dir = Path(__file__).parent
-    
-    # Список скриптов для выполнения в порядке
-    scripts = [
-        {
-            "path": str(deploy_dir / "create_admin.py"),
-            "description": "Создание администратора"
-        },
-        {
-            "path": str(deploy_dir / "seed_equipment_data.py"),
-            "description": "Заполнение базы данных оборудованием"
-        }
-    ]
-    
-    success_count = 0
-    total_scripts = len(scripts)
-    
-    for script in scripts:
-        if run_script(script["path"], script["description"]):
-            success_count += 1
-        else:
-            print(f"\n❌ КРИТИЧЕСКАЯ ОШИБКА: Не удалось выполнить {script['description']}")
-            print("🛑 Развертывание прервано!")
-            return False
-    
+
+    started = time.perf_counter()
+    results = await run_steps(DEPLOY_STEPS)
+    elapsed = time.perf_counter() - started
+
+    success_count = sum(results.values())
+    total_steps = len(results)
+
     # Итоговый отчет
     print(f"\n{'='*60}")
     print("📊 ИТОГОВЫЙ ОТЧЕТ РАЗВЕРТЫВАНИЯ")
     print(f"{'='*60}")
-    print(f"✅ Успешно выполнено: {success_count}/{total_scripts} скриптов")
-    
-    if success_count == total_scripts:
+    print(f"✅ Успешно выполнено: {success_count}/{total_steps} шагов за {elapsed:.2f} с")
+
+    if success_count == total_steps:
         print("🎉 РАЗВЕРТЫВАНИЕ ЗАВЕРШЕНО УСПЕШНО!")
         print("\n📋 Что было создано:")
         print("  👤 Администратор системы")
@@ -85,14 +147,20 @@ def main():
         print("  🏷️  Системы брендов")
         print("  🎒 Аксессуары")
         print("\n🔑 Данные для входа администратора:")
-        print("  📧 Email: admin@rentalapp.com")
-        print("  🔑 Пароль: AdminRental2024!")
+        print(f"  📧 Email: {ADMIN_EMAIL}")
+        print(f"  🔑 Пароль: {ADMIN_PASSWORD}")
         print("\n🚀 Система готова к использованию!")
     else:
         print("❌ РАЗВЕРТЫВАНИЕ ЗАВЕРШЕНО С ОШИБКАМИ")
         print("Проверьте логи выше для диагностики проблем.")
-    
-    return success_count == total_scripts
+
+    return success_count == total_steps
+
+
+def main():
+    """Точка входа: запускает развертывание в одном цикле событий."""
+    return asyncio.run(deploy())
+
 
 if __name__ == "__main__":
     success = main()
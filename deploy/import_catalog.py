@@ -0,0 +1,402 @@
+#!/usr/bin/env python3
+"""
+Скрипт потокового импорта каталога из CSV/JSONL файлов.
+Читает системы брендов, аксессуары и оборудование построчно, валидирует
+и записывает их пачками фиксированного размера, сохраняя контрольную точку
+после каждой пачки. Потребление памяти не зависит от размера файла, а
+прерванный импорт продолжается с места остановки.
+"""
+
+import argparse
+import asyncio
+import csv
+import hashlib
+import json
+import math
+import os
+import time
+from itertools import islice
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from pydantic import ValidationError
+from sqlalchemy.exc import DBAPIError
+
+from seed_equipment_data import (
+    AsyncSessionLocal,
+    Accessory,
+    BrandSystem,
+    Equipment,
+    BULK_BATCH_SIZE,
+    _build_equipment_row,
+    _report_conflicts,
+    bulk_insert_rows,
+    bulk_link_brand_systems,
+    fetch_existing_names,
+    fetch_name_to_id,
+)
+
+CHECKPOINT_SUFFIX = ".checkpoint.json"
+
+
+# ───────────────────────────── Чтение источников ─────────────────────────────
+
+def _skip_record(number: int, reason: str):
+    """Сообщает о записи, пропущенной из-за ошибки разбора."""
+    print(f"  ❌ Запись {number}: {reason} - пропущена")
+
+
+def _read_lines(source, position: Dict[str, int]) -> Iterator[str]:
+    """Читает строки двоичного файла, запоминая смещение конца последней прочитанной строки."""
+    for line in iter(source.readline, b""):
+        position["offset"] = source.tell()
+        yield line.decode("utf-8", errors="replace")
+
+
+def _parse_csv(source, position: Dict[str, int], offset: int) -> Iterator[Any]:
+    """Разбирает CSV с заголовком; вместо некорректной строки возвращает текст ошибки."""
+    header = next(csv.reader([source.readline().decode("utf-8-sig")]), None)
+    if not header:
+        return
+    if offset:
+        source.seek(offset)
+    rows = csv.reader(_read_lines(source, position))
+    while True:
+        try:
+            row = next(rows)
+        except StopIteration:
+            return
+        except csv.Error as e:
+            yield f"некорректная строка CSV: {e}"
+            continue
+        if not row:
+            continue
+        if len(row) != len(header):
+            yield f"ожидалось {len(header)} полей, получено {len(row)}"
+            continue
+        yield {key: (value if value != "" else None) for key, value in zip(header, row)}
+
+
+def _parse_jsonl(source, position: Dict[str, int], offset: int) -> Iterator[Any]:
+    """Разбирает JSONL; вместо некорректной строки возвращает текст ошибки."""
+    source.seek(offset)
+    for line in _read_lines(source, position):
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            yield json.loads(line)
+        except ValueError as e:
+            yield f"некорректный JSON: {e}"
+
+
+def read_records(path: str, offset: int = 0, rows_done: int = 0) -> Iterator[Tuple[int, int, Dict[str, Any]]]:
+    """
+    Лениво читает записи из CSV (с заголовком) или JSONL файла начиная с
+    байтового смещения offset. Возвращает (номер записи, смещение после нее, запись).
+    Некорректные записи и записи без имени пропускаются с сообщением.
+    """
+    parse = _parse_csv if path.lower().endswith(".csv") else _parse_jsonl
+    number = rows_done
+    with open(path, "rb") as source:
+        position = {"offset": offset}
+        for record in parse(source, position, offset):
+            number += 1
+            if isinstance(record, str):
+                _skip_record(number, record)
+            elif not isinstance(record, dict) or not isinstance(record.get("name"), str) or not record["name"]:
+                _skip_record(number, "нет строкового поля name")
+            else:
+                yield number, position["offset"], record
+
+
+def chunked(records: Iterable[Any], size: int) -> Iterator[List[Any]]:
+    """Группирует записи в пачки фиксированного размера."""
+    iterator = iter(records)
+    while True:
+        chunk = list(islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def _parse_image_urls(value: Any) -> List[str]:
+    """Приводит image_urls к списку: JSON-массив или строка с разделителем '|'."""
+    if value is None:
+        return []
+    if isinstance(value, str):
+        value = value.strip()
+        if not value.startswith("["):
+            return [url.strip() for url in value.split("|") if url.strip()]
+        value = json.loads(value)
+    if not isinstance(value, list) or not all(isinstance(url, str) for url in value):
+        raise ValueError("image_urls должно быть списком строк или строкой с разделителем '|'")
+    return value
+
+
+def _text_field(record: Dict[str, Any], field: str, required: bool = False) -> Optional[str]:
+    """Возвращает строковое поле записи; ValueError, если поле не строка или не заполнено обязательное."""
+    value = record.get(field)
+    if value is None or value == "":
+        if required:
+            raise ValueError(f"не заполнено поле {field}")
+        return None
+    if not isinstance(value, str):
+        raise ValueError(f"поле {field} должно быть строкой")
+    return value
+
+
+def _price_field(record: Dict[str, Any]) -> float:
+    """Возвращает цену записи; ValueError, если цена не неотрицательное число."""
+    value = record.get("price")
+    if isinstance(value, bool):
+        raise ValueError("некорректная цена")
+    try:
+        price = float(value)
+    except (TypeError, ValueError):
+        raise ValueError("некорректная цена") from None
+    if not math.isfinite(price) or price < 0:
+        raise ValueError("некорректная цена")
+    return price
+
+
+# ───────────────────────────── Контрольные точки ─────────────────────────────
+
+def load_checkpoint(source_path: str) -> Tuple[int, int]:
+    """
+    Возвращает количество уже обработанных записей источника и байтовое
+    смещение, с которого продолжается чтение ((0, 0), если импорт не начинался).
+    """
+    checkpoint_path = source_path + CHECKPOINT_SUFFIX
+    if not os.path.exists(checkpoint_path):
+        return 0, 0
+    with open(checkpoint_path, encoding="utf-8") as checkpoint_file:
+        checkpoint = json.load(checkpoint_file)
+    if checkpoint.get("source_size") != os.path.getsize(source_path) or "offset" not in checkpoint:
+        print(f"  ⚠️  Файл {source_path} изменился после прошлого запуска, импорт начнется сначала")
+        return 0, 0
+    return checkpoint["rows_done"], checkpoint["offset"]
+
+
+def save_checkpoint(source_path: str, rows_done: int, offset: int):
+    """Атомарно сохраняет количество обработанных записей и смещение в источнике."""
+    checkpoint_path = source_path + CHECKPOINT_SUFFIX
+    temp_path = checkpoint_path + ".tmp"
+    with open(temp_path, "w", encoding="utf-8") as checkpoint_file:
+        json.dump({
+            "source": os.path.abspath(source_path),
+            "source_size": os.path.getsize(source_path),
+            "rows_done": rows_done,
+            "offset": offset,
+        }, checkpoint_file)
+    os.replace(temp_path, checkpoint_path)
+
+
+def clear_checkpoint(source_path: str):
+    """Удаляет контрольную точку после успешного завершения импорта."""
+    checkpoint_path = source_path + CHECKPOINT_SUFFIX
+    if os.path.exists(checkpoint_path):
+        os.remove(checkpoint_path)
+
+
+# ───────────────────────────── Запись пачек ─────────────────────────────
+
+def import_serial_number(name: str) -> str:
+    """
+    Серийный номер для записи без serial_number. Выводится из имени - ключа
+    дедупликации, поэтому не зависит от позиции записи в файле, совпадает при
+    повторных запусках и не пересекается с SN... из seed_equipment_data.py.
+    """
+    return f"IMP-{hashlib.sha1(name.encode('utf-8')).hexdigest()[:12].upper()}"
+
+
+async def import_brand_systems_chunk(db_session, chunk: List[Tuple[int, Dict[str, Any]]]) -> int:
+    """Записывает пачку систем брендов. Возвращает количество созданных записей."""
+    existing = await fetch_existing_names(db_session, BrandSystem, (record["name"] for _, record in chunk))
+    rows = []
+    for line_number, record in chunk:
+        if record["name"] in existing:
+            continue
+        try:
+            row = {"name": record["name"], "description": _text_field(record, "description")}
+        except ValueError as e:
+            _skip_record(line_number, f"система брендов '{record['name']}': {e}")
+            continue
+        existing.add(record["name"])
+        rows.append(row)
+    inserted = await bulk_insert_rows(db_session, BrandSystem, rows)
+    _report_conflicts("Системы брендов", rows, inserted)
+    return len(inserted)
+
+
+async def import_accessories_chunk(db_session, chunk: List[Tuple[int, Dict[str, Any]]]) -> int:
+    """Записывает пачку аксессуаров. Возвращает количество созданных записей."""
+    existing = await fetch_existing_names(db_session, Accessory, (record["name"] for _, record in chunk))
+    rows = []
+    for line_number, record in chunk:
+        if record["name"] in existing:
+            continue
+        try:
+            row = {
+                "name": record["name"],
+                "accessory_type": _text_field(record, "accessory_type", required=True),
+                "price": _price_field(record),
+                "description": _text_field(record, "description")
+            }
+        except ValueError as e:
+            _skip_record(line_number, f"аксессуар '{record['name']}': {e}")
+            continue
+        existing.add(record["name"])
+        rows.append(row)
+    inserted = await bulk_insert_rows(db_session, Accessory, rows)
+    _report_conflicts("Аксессуары", rows, inserted)
+    return len(inserted)
+
+
+async def import_equipment_chunk(db_session, chunk: List[Tuple[int, Dict[str, Any]]]) -> int:
+    """
+    Валидирует пачку оборудования через EquipmentCreate, записывает её
+    и связи с системами брендов. Записям без serial_number присваивается
+    номер из import_serial_number. Возвращает количество созданных записей.
+    """
+    existing = await fetch_existing_names(db_session, Equipment, (record["name"] for _, record in chunk))
+
+    rows = []
+    brand_system_by_name = {}
+    for line_number, record in chunk:
+        if record["name"] in existing:
+            continue
+        try:
+            brand_system = _text_field(record, "brand_system")
+            equipment_data = {
+                **record,
+                "serial_number": record.get("serial_number") or import_serial_number(record["name"]),
+                "image_urls": _parse_image_urls(record.get("image_urls")),
+            }
+            rows.append(_build_equipment_row(equipment_data, line_number))
+        except (ValidationError, ValueError, TypeError, AttributeError) as e:
+            _skip_record(line_number, f"оборудование '{record['name']}' не прошло валидацию: {e}")
+            continue
+        existing.add(record["name"])
+        if brand_system:
+            brand_system_by_name[record["name"]] = brand_system
+
+    inserted = await bulk_insert_rows(db_session, Equipment, rows)
+    _report_conflicts("Оборудование", rows, inserted)
+    brand_system_ids = await fetch_name_to_id(db_session, BrandSystem, set(brand_system_by_name.values()))
+    links = [
+        (equipment_id, brand_system_ids[brand_system_by_name[name]])
+        for name, equipment_id in inserted.items()
+        if brand_system_by_name.get(name) in brand_system_ids
+    ]
+    await bulk_link_brand_systems(db_session, links)
+    return len(inserted)
+
+
+async def import_chunk_with_fallback(db_session, import_chunk: Callable,
+                                     chunk: List[Tuple[int, Dict[str, Any]]]) -> int:
+    """
+    Записывает пачку в точке сохранения. Если база данных отклонила пачку,
+    повторяет запись по одной записи, пропуская отклоненные, чтобы одна
+    некорректная запись не останавливала импорт.
+    """
+    try:
+        async with db_session.begin_nested():
+            return await import_chunk(db_session, chunk)
+    except DBAPIError as e:
+        print(f"  ⚠️  Пачка записей {chunk[0][0]}-{chunk[-1][0]} отклонена базой данных ({e.orig}), "
+              f"запись по одной")
+
+    created = 0
+    for item in chunk:
+        try:
+            async with db_session.begin_nested():
+                created += await import_chunk(db_session, [item])
+        except DBAPIError as e:
+            _skip_record(item[0], f"ошибка базы данных: {e.orig}")
+    return created
+
+
+async def import_file(db_session, source_path: str, description: str,
+                      import_chunk: Callable, batch_size: int) -> int:
+    """
+    Импортирует файл пачками фиксированного размера. После каждой пачки
+    фиксирует транзакцию и сохраняет контрольную точку.
+    """
+    rows_done, offset = load_checkpoint(source_path)
+    if rows_done:
+        print(f"  ⏩ {description}: продолжение с записи {rows_done + 1}")
+
+    records = read_records(source_path, offset, rows_done)
+    created = 0
+    started = time.perf_counter()
+
+    for chunk in chunked(records, batch_size):
+        created += await import_chunk_with_fallback(
+            db_session, import_chunk, [(number, record) for number, _, record in chunk]
+        )
+        await db_session.commit()
+        rows_done, offset = chunk[-1][0], chunk[-1][1]
+        save_checkpoint(source_path, rows_done, offset)
+
+        elapsed = time.perf_counter() - started
+        print(f"  📦 {description}: обработано {rows_done} записей, создано {created} "
+              f"({created / elapsed if elapsed else 0:.0f} строк/с)")
+
+    clear_checkpoint(source_path)
+    print(f"  ✅ {description}: создано {created} за {time.perf_counter() - started:.2f} с")
+    return created
+
+
+async def import_catalog(brand_systems_path: str = None, accessories_path: str = None,
+                         equipment_path: str = None, batch_size: int = BULK_BATCH_SIZE):
+    """Основная функция потокового импорта каталога."""
+    print(f"🚀 Запуск потокового импорта каталога (пачки по {batch_size})...")
+    db_session = AsyncSessionLocal()
+
+    # Системы брендов импортируются первыми: оборудование ссылается на них по имени
+    sources = [
+        (brand_systems_path, "🔧 Системы брендов", import_brand_systems_chunk),
+        (accessories_path, "🎒 Аксессуары", import_accessories_chunk),
+        (equipment_path, "📷 Оборудование", import_equipment_chunk),
+    ]
+
+    try:
+        for source_path, description, import_chunk in sources:
+            if source_path:
+                await import_file(db_session, source_path, description, import_chunk, batch_size)
+
+        print("✅ Импорт каталога завершен!")
+
+    except Exception as e:
+        await db_session.rollback()
+        print(f"❌ Произошла ошибка: {e}")
+        print("🔁 Повторный запуск продолжит импорт с последней контрольной точки")
+        raise
+    finally:
+        await db_session.close()
+        print("🏁 Скрипт завершил работу.")
+
+
+def parse_args():
+    """Разбирает аргументы командной строки."""
+    parser = argparse.ArgumentParser(description="Потоковый импорт каталога из CSV/JSONL файлов")
+    parser.add_argument("--brand-systems", help="файл систем брендов (.csv или .jsonl)")
+    parser.add_argument("--accessories", help="файл аксессуаров (.csv или .jsonl)")
+    parser.add_argument("--equipment", help="файл оборудования (.csv или .jsonl)")
+    parser.add_argument("--batch-size", type=int, default=BULK_BATCH_SIZE,
+                        help=f"размер пачки (по умолчанию {BULK_BATCH_SIZE})")
+    parser.add_argument("--restart", action="store_true",
+                        help="игнорировать сохраненные контрольные точки и начать импорт сначала")
+    args = parser.parse_args()
+    if not (args.brand_systems or args.accessories or args.equipment):
+        parser.error("укажите хотя бы один файл для импорта")
+    return args
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    if args.restart:
+        for path in (args.brand_systems, args.accessories, args.equipment):
+            if path:
+                clear_checkpoint(path)
+    asyncio.run(import_catalog(args.brand_systems, args.accessories, args.equipment, args.batch_size))
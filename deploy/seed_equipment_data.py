@@ -4,12 +4,17 @@
 Адаптирует данные с Bukza под критерии приложения аренды оборудования.
 """
 
+import argparse
 import asyncio
 import sys
 import os
+import time
 from decimal import Decimal
 from datetime import date
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Iterable, Set
+
+from sqlalchemy import select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 
 # Добавляем корневую директорию проекта в путь, чтобы работали импорты
 sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'RentalApp_FASTAPI'))
@@ -23,6 +28,10 @@ from api.repositories.brand_system_repository import BrandSystemRepository
 from api.repositories.accessory_repository import AccessoryRepository
 from shared.schemas.equipment_schema import EquipmentCreate
 
+# Размер пачки для массовой вставки (bulk-режим).
+# asyncpg ограничивает запрос 32767 параметрами, 1000 строк укладываются с запасом.
+BULK_BATCH_SIZE = 1000
+
 # Данные оборудования, адаптированные под приложение аренды
 EQUIPMENT_DATA = [
     # Фотоаппараты
@@ -452,5 +461,229 @@ async def seed_database():
         await db_session.close()
         print("🏁 Скрипт завершил работу.")
 
+# ───────────────────────────── Bulk-режим ─────────────────────────────
+# Вместо поиска по имени и коммита на каждую запись существующие имена
+# загружаются одним запросом на таблицу, новые строки вставляются пачками
+# INSERT ... ON CONFLICT DO NOTHING, а связи оборудования с системами брендов
+# записываются одним проходом. Все изменения фиксируются одной транзакцией.
+
+def _build_equipment_row(equipment_data: Dict[str, Any], index: int) -> Dict[str, Any]:
+    """Валидирует данные оборудования через EquipmentCreate и возвращает строку для вставки."""
+    equipment_create = EquipmentCreate(
+        equipment_type=equipment_data.get("equipment_type"),
+        brand=equipment_data.get("brand"),
+        name=equipment_data.get("name"),
+        description=equipment_data.get("description"),
+        daily_rate=equipment_data.get("daily_rate"),
+        condition=equipment_data.get("condition"),
+        image_urls=equipment_data.get("image_urls") or [],
+        short_description=equipment_data.get("short_description"),
+        serial_number=equipment_data.get("serial_number") or f"SN{1000 + index:06d}"
+    )
+    columns = Equipment.__table__.c
+    return {
+        key: value
+        for key, value in equipment_create.model_dump().items()
+        if key in columns
+    }
+
+
+def _brand_system_link_columns():
+    """Возвращает таблицу связей оборудования с системами брендов и её колонки (equipment, brand_system)."""
+    secondary = Equipment.brand_systems.property.secondary
+    equipment_column = brand_system_column = None
+    for column in secondary.c:
+        for foreign_key in column.foreign_keys:
+            if foreign_key.column.table is Equipment.__table__:
+                equipment_column = column
+            elif foreign_key.column.table is BrandSystem.__table__:
+                brand_system_column = column
+    return secondary, equipment_column, brand_system_column
+
+
+async def fetch_existing_names(db_session, model, names: Iterable[str] = None) -> Set[str]:
+    """Загружает существующие имена таблицы одним запросом (при names - только среди них)."""
+    query = select(model.name)
+    if names is not None:
+        query = query.where(model.name.in_(list(names)))
+    result = await db_session.execute(query)
+    return set(result.scalars().all())
+
+
+async def fetch_name_to_id(db_session, model, names: Iterable[str] = None) -> Dict[str, int]:
+    """Загружает соответствие имя → id одним запросом (при names - только для них)."""
+    query = select(model.name, model.id)
+    if names is not None:
+        query = query.where(model.name.in_(list(names)))
+    result = await db_session.execute(query)
+    return {name: record_id for name, record_id in result.all()}
+
+
+async def bulk_insert_rows(db_session, model, rows: List[Dict[str, Any]],
+                           batch_size: int = BULK_BATCH_SIZE) -> Dict[str, int]:
+    """
+    Вставляет строки пачками INSERT ... ON CONFLICT DO NOTHING.
+    Возвращает соответствие имя → id для фактически вставленных строк.
+    """
+    table = model.__table__
+    inserted: Dict[str, int] = {}
+    for start in range(0, len(rows), batch_size):
+        batch = rows[start:start + batch_size]
+        statement = (
+            pg_insert(table)
+            .values(batch)
+            .on_conflict_do_nothing()
+            .returning(table.c.id, table.c.name)
+        )
+        result = await db_session.execute(statement)
+        inserted.update({name: record_id for record_id, name in result.all()})
+    return inserted
+
+
+def _report_conflicts(kind: str, rows: List[Dict[str, Any]], inserted: Dict[str, int]):
+    """Сообщает о строках, пропущенных INSERT ... ON CONFLICT DO NOTHING."""
+    skipped = [row["name"] for row in rows if row["name"] not in inserted]
+    if skipped:
+        examples = ", ".join(f"'{name}'" for name in skipped[:5])
+        print(f"  ⚠️  {kind}: {len(skipped)} записей пропущено из-за конфликта уникальности "
+              f"(например: {examples})")
+
+
+async def bulk_link_brand_systems(db_session, links: Iterable[tuple],
+                                  batch_size: int = BULK_BATCH_SIZE) -> int:
+    """Записывает связи (equipment_id, brand_system_id) пачками. Возвращает количество связей."""
+    secondary, equipment_column, brand_system_column = _brand_system_link_columns()
+    rows = [
+        {equipment_column.name: equipment_id, brand_system_column.name: brand_system_id}
+        for equipment_id, brand_system_id in links
+    ]
+    for start in range(0, len(rows), batch_size):
+        await db_session.execute(
+            pg_insert(secondary).values(rows[start:start + batch_size]).on_conflict_do_nothing()
+        )
+    return len(rows)
+
+
+async def bulk_create_brand_systems(db_session, brand_systems_data: List[Dict[str, Any]] = None,
+                                    batch_size: int = BULK_BATCH_SIZE) -> int:
+    """Массово создает системы брендов. Возвращает количество созданных записей."""
+    brand_systems_data = BRAND_SYSTEMS_DATA if brand_systems_data is None else brand_systems_data
+    seen = await fetch_existing_names(db_session, BrandSystem)
+    rows = []
+    for system_data in brand_systems_data:
+        if system_data["name"] in seen:
+            continue
+        seen.add(system_data["name"])
+        rows.append({"name": system_data["name"], "description": system_data["description"]})
+    inserted = await bulk_insert_rows(db_session, BrandSystem, rows, batch_size)
+    _report_conflicts("Системы брендов", rows, inserted)
+    return len(inserted)
+
+
+async def bulk_create_accessories(db_session, accessories_data: List[Dict[str, Any]] = None,
+                                  batch_size: int = BULK_BATCH_SIZE) -> int:
+    """Массово создает аксессуары. Возвращает количество созданных записей."""
+    accessories_data = ACCESSORIES_DATA if accessories_data is None else accessories_data
+    seen = await fetch_existing_names(db_session, Accessory)
+    rows = []
+    for accessory_data in accessories_data:
+        if accessory_data["name"] in seen:
+            continue
+        seen.add(accessory_data["name"])
+        rows.append({
+            "name": accessory_data["name"],
+            "accessory_type": accessory_data["accessory_type"],
+            "price": accessory_data["price"],
+            "description": accessory_data["description"]
+        })
+    inserted = await bulk_insert_rows(db_session, Accessory, rows, batch_size)
+    _report_conflicts("Аксессуары", rows, inserted)
+    return len(inserted)
+
+
+async def bulk_create_equipment(db_session, equipment_data_list: List[Dict[str, Any]] = None,
+                                batch_size: int = BULK_BATCH_SIZE, existing_names: Set[str] = None) -> int:
+    """
+    Массово создает оборудование и его связи с системами брендов.
+    existing_names - уже загруженные имена существующего оборудования (иначе загружаются все).
+    Возвращает количество созданных единиц оборудования.
+    """
+    equipment_data_list = EQUIPMENT_DATA if equipment_data_list is None else equipment_data_list
+    seen = await fetch_existing_names(db_session, Equipment) if existing_names is None else existing_names
+    brand_system_ids = await fetch_name_to_id(db_session, BrandSystem)
+
+    rows = []
+    brand_system_by_name = {}
+    for i, equipment_data in enumerate(equipment_data_list, 1):
+        if equipment_data["name"] in seen:
+            continue
+        seen.add(equipment_data["name"])
+        rows.append(_build_equipment_row(equipment_data, i))
+        if equipment_data.get("brand_system"):
+            brand_system_by_name[equipment_data["name"]] = equipment_data["brand_system"]
+
+    inserted = await bulk_insert_rows(db_session, Equipment, rows, batch_size)
+    _report_conflicts("Оборудование", rows, inserted)
+
+    links = [
+        (equipment_id, brand_system_ids[brand_system_by_name[name]])
+        for name, equipment_id in inserted.items()
+        if brand_system_by_name.get(name) in brand_system_ids
+    ]
+    await bulk_link_brand_systems(db_session, links, batch_size)
+    return len(inserted)
+
+
+async def seed_database_bulk(batch_size: int = BULK_BATCH_SIZE):
+    """Заполняет базу данных в bulk-режиме и выводит скорость вставки."""
+    print(f"🚀 Запуск массового заполнения базы данных (пачки по {batch_size})...")
+    db_session = AsyncSessionLocal()
+    started = time.perf_counter()
+
+    try:
+        steps = [
+            ("🔧 Системы брендов", bulk_create_brand_systems),
+            ("🎒 Аксессуары", bulk_create_accessories),
+            ("📷 Оборудование", bulk_create_equipment),
+        ]
+        total_created = 0
+        for description, step in steps:
+            step_started = time.perf_counter()
+            created = await step(db_session, batch_size=batch_size)
+            elapsed = time.perf_counter() - step_started
+            total_created += created
+            print(f"  ✅ {description}: создано {created} за {elapsed:.2f} с "
+                  f"({created / elapsed if elapsed else 0:.0f} строк/с)")
+
+        await db_session.commit()
+
+        elapsed = time.perf_counter() - started
+        print("✅ База данных успешно заполнена начальными данными!")
+        print(f"📊 Всего создано {total_created} записей за {elapsed:.2f} с "
+              f"({total_created / elapsed if elapsed else 0:.0f} строк/с)")
+
+    except Exception as e:
+        await db_session.rollback()
+        print(f"❌ Произошла ошибка: {e}")
+        raise
+    finally:
+        await db_session.close()
+        print("🏁 Скрипт завершил работу.")
+
+
+def parse_args():
+    """Разбирает аргументы командной строки."""
+    parser = argparse.ArgumentParser(description="Заполнение базы данных начальными данными оборудования")
+    parser.add_argument("--bulk", action="store_true",
+                        help="массовая вставка пачками вместо построчного создания")
+    parser.add_argument("--batch-size", type=int, default=BULK_BATCH_SIZE,
+                        help=f"размер пачки для bulk-режима (по умолчанию {BULK_BATCH_SIZE})")
+    return parser.parse_args()
+
+
 if __name__ == "__main__":
-    asyncio.run(seed_database())
+    args = parse_args()
+    if args.bulk:
+        asyncio.run(seed_database_bulk(args.batch_size))
+    else:
+        asyncio.run(seed_database())
@@ -0,0 +1,335 @@
+#!/usr/bin/env python3
+"""
+Скрипт для заполнения базы данных синтетическим каталогом и пользователями
+для нагрузочного тестирования. Масштабирует данные seed_equipment_data.py
+до заданного количества единиц оборудования, создает пользователей с
+общим паролем, под которыми scripts/load_test.py создает резервации, и
+историю аренд за заданное количество лет для дашборда и календаря.
+"""
+
+import argparse
+import asyncio
+import random
+import sys
+import os
+import time
+from datetime import date, datetime, time as day_time, timedelta, timezone
+from typing import Any, Dict, Iterator, List, Tuple
+
+from sqlalchemy import DateTime, select
+
+# Добавляем корневую директорию проекта в путь, чтобы работали импорты
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'RentalApp_FASTAPI'))
+
+from api.models.user import User
+from api.models.rental import Rental
+from api.models.reservation import Reservation
+from api.utils.password_utils import hash_password
+from seed_equipment_data import (
+    AsyncSessionLocal,
+    EQUIPMENT_DATA,
+    BULK_BATCH_SIZE,
+    bulk_create_accessories,
+    bulk_create_brand_systems,
+    bulk_create_equipment,
+    fetch_existing_names,
+    Equipment,
+)
+
+# --- Данные пользователей нагрузочного теста ---
+LOAD_TEST_EMAIL_TEMPLATE = "loadtest_{index:06d}@rentalapp.com"
+LOAD_TEST_PASSWORD = "LoadTest2024!"
+# ------------------------------------
+
+# --- Параметры истории аренд ---
+HISTORY_NOTE = "Синтетическая история для нагрузочного тестирования"
+UPCOMING_DAYS = 30  # горизонт будущих резерваций
+MAX_RENTAL_DAYS = 7
+MAX_RENTAL_ITEMS = 3
+# ------------------------------------
+
+
+def generate_equipment(count: int):
+    """Лениво генерирует count единиц оборудования на основе EQUIPMENT_DATA."""
+    for index in range(count):
+        template = EQUIPMENT_DATA[index % len(EQUIPMENT_DATA)]
+        copy_number = index // len(EQUIPMENT_DATA) + 1
+        yield {
+            **template,
+            "name": f"{template['name']} #{copy_number}",
+            "serial_number": f"LT{index + 1:08d}",
+        }
+
+
+async def create_load_test_users(db_session, count: int, batch_size: int = BULK_BATCH_SIZE) -> int:
+    """Массово создает пользователей нагрузочного теста. Возвращает количество созданных."""
+    # Хеширование пароля намеренно медленное, поэтому пароль общий и хешируется один раз
+    hashed_password = hash_password(LOAD_TEST_PASSWORD)
+    table = User.__table__
+    created = 0
+
+    for start in range(1, count + 1, batch_size):
+        emails = {
+            index: LOAD_TEST_EMAIL_TEMPLATE.format(index=index)
+            for index in range(start, min(start + batch_size, count + 1))
+        }
+        result = await db_session.execute(select(User.email).where(User.email.in_(list(emails.values()))))
+        existing = set(result.scalars().all())
+        rows = [
+            {
+                "full_name": f"Нагрузочный пользователь {index}",
+                "email": email,
+                "hashed_password": hashed_password,
+                "phone": f"+7 (900) {index // 10000 % 1000:03d}-{index // 100 % 100:02d}-{index % 100:02d}",
+                "role": "client",
+                "is_active": True,
+                "status": "Активный",
+                "balance": 0.0,
+                "notes": "Создан для нагрузочного тестирования",
+                "privacy_policy_accepted": True,
+                "terms_accepted": True,
+                "email_verified": True
+            }
+            for index, email in emails.items()
+            if email not in existing
+        ]
+        if rows:
+            await db_session.execute(table.insert().values(rows))
+            created += len(rows)
+    return created
+
+
+async def create_equipment_batch(db_session, batch, batch_size: int) -> int:
+    """Создает пачку оборудования, загружая существующие имена только для этой пачки."""
+    existing = await fetch_existing_names(db_session, Equipment, (item["name"] for item in batch))
+    return await bulk_create_equipment(db_session, batch, batch_size, existing_names=existing)
+
+
+def _equipment_link_columns(model):
+    """Возвращает таблицу связей модели с оборудованием и её колонки (модель, оборудование)."""
+    secondary = model.equipment.property.secondary
+    owner_column = equipment_column = None
+    for column in secondary.c:
+        for foreign_key in column.foreign_keys:
+            if foreign_key.column.table is model.__table__:
+                owner_column = column
+            elif foreign_key.column.table is Equipment.__table__:
+                equipment_column = column
+    return secondary, owner_column, equipment_column
+
+
+def _status(model, name: str):
+    """Значение колонки status модели по имени статуса (ACTIVE, COMPLETED, ...)."""
+    enum_class = getattr(model.__table__.c.status.type, "enum_class", None)
+    if enum_class is None:
+        return name.lower()
+    for member in enum_class:
+        if member.name == name or str(member.value).lower() == name.lower():
+            return member
+    raise ValueError(f"{model.__name__}.status не содержит статуса {name}")
+
+
+def _build_history_row(model, values: Dict[str, Any]) -> Dict[str, Any]:
+    """Оставляет только колонки модели и приводит даты к типу колонки."""
+    columns = model.__table__.c
+    row = {}
+    for key, value in values.items():
+        if key not in columns:
+            continue
+        column_type = columns[key].type
+        if isinstance(column_type, DateTime) and type(value) is date:
+            value = datetime.combine(value, day_time(10), tzinfo=timezone.utc if column_type.timezone else None)
+        row[key] = value
+    return row
+
+
+def generate_history(equipment_rates: Dict[int, float], user_ids: List[int], admin_id: int,
+                     years: int, rentals_per_day: int, rng: random.Random) -> Iterator[Tuple[Any, Dict, List[int]]]:
+    """
+    Лениво генерирует историю (модель, строка, id оборудования) по дням от years
+    лет назад до UPCOMING_DAYS вперед. Одна единица оборудования не выдается на
+    пересекающиеся периоды. Прошедшие аренды завершены (часть недавних просрочена),
+    текущие активны, будущие периоды - подтвержденные резервации.
+    """
+    today = date.today()
+    equipment_ids = list(equipment_rates)
+    free_from: Dict[int, date] = {}
+    statuses = {
+        name: _status(Rental, name) for name in ("ACTIVE", "OVERDUE", "COMPLETED")
+    }
+    confirmed = _status(Reservation, "CONFIRMED")
+
+    day = today - timedelta(days=365 * years)
+    while day < today + timedelta(days=UPCOMING_DAYS):
+        for _ in range(rentals_per_day):
+            candidates = rng.sample(equipment_ids, min(rng.randint(1, MAX_RENTAL_ITEMS), len(equipment_ids)))
+            items = [item for item in candidates if free_from.get(item, day) <= day]
+            if not items:
+                continue
+            end = day + timedelta(days=rng.randint(1, MAX_RENTAL_DAYS))
+            for item in items:
+                free_from[item] = end + timedelta(days=1)
+            cost = round(sum(equipment_rates[item] for item in items) * (end - day).days, 2)
+            user_id = rng.choice(user_ids)
+
+            if day > today:
+                yield Reservation, _build_history_row(Reservation, {
+                    "user_id": user_id,
+                    "start_date": day,
+                    "end_date": end,
+                    "status": confirmed,
+                    "total_amount": cost,
+                    "deposit_amount": 0.0,
+                    "notes": HISTORY_NOTE,
+                    "created_at": day - timedelta(days=rng.randint(1, UPCOMING_DAYS)),
+                }), items
+                continue
+
+            if end >= today:
+                status = "ACTIVE"
+            elif today - end <= timedelta(days=14) and rng.random() < 0.05:
+                status = "OVERDUE"
+            else:
+                status = "COMPLETED"
+            yield Rental, _build_history_row(Rental, {
+                "user_id": user_id,
+                "created_by_id": admin_id,
+                "reservation_id": None,
+                "start_date": day,
+                "end_date": end,
+                "status": statuses[status],
+                "total_cost": cost,
+                "discount_amount": 0.0,
+                "final_cost": cost,
+                "deposit_amount": 0.0,
+                "prepayment_amount": 0.0,
+                "notes_on_issue": HISTORY_NOTE,
+                "actual_start": day,
+                "actual_end": end if status == "COMPLETED" else None,
+                "created_at": day,
+            }), items
+        day += timedelta(days=1)
+
+
+async def insert_history_batch(db_session, batch: List[Tuple[Any, Dict, List[int]]]) -> int:
+    """Вставляет пачку аренд и резерваций вместе со связями с оборудованием. Возвращает количество строк."""
+    for model in (Rental, Reservation):
+        items = [(row, equipment_ids) for row_model, row, equipment_ids in batch if row_model is model]
+        if not items:
+            continue
+        table = model.__table__
+        result = await db_session.execute(
+            table.insert().returning(table.c.id, sort_by_parameter_order=True),
+            [row for row, _ in items]
+        )
+        secondary, owner_column, equipment_column = _equipment_link_columns(model)
+        links = [
+            {owner_column.name: record_id, equipment_column.name: equipment_id}
+            for record_id, (_, equipment_ids) in zip(result.scalars().all(), items)
+            for equipment_id in equipment_ids
+        ]
+        if links:
+            await db_session.execute(secondary.insert(), links)
+    return len(batch)
+
+
+async def create_rental_history(db_session, years: int, rentals_per_day: int, seed: int,
+                                batch_size: int = BULK_BATCH_SIZE) -> int:
+    """
+    Создает историю аренд и резерваций за years лет для пользователей
+    нагрузочного теста. Повторно не создается. Возвращает количество записей.
+    """
+    result = await db_session.execute(select(Rental.id).where(Rental.notes_on_issue == HISTORY_NOTE).limit(1))
+    if result.first():
+        print("ℹ️  История аренд уже создана - пропускаем")
+        return 0
+
+    result = await db_session.execute(select(Equipment.id, Equipment.daily_rate))
+    equipment_rates = {equipment_id: float(daily_rate or 0) for equipment_id, daily_rate in result.all()}
+    result = await db_session.execute(
+        select(User.id).where(User.email.like(LOAD_TEST_EMAIL_TEMPLATE.replace("{index:06d}", "%")))
+    )
+    user_ids = list(result.scalars().all())
+    result = await db_session.execute(select(User.id).where(User.role == "admin").limit(1))
+    admin_id = result.scalar()
+    if not equipment_rates or not user_ids:
+        print("⚠️  Нет оборудования или пользователей нагрузочного теста - история аренд не создана")
+        return 0
+
+    created = 0
+    batch = []
+    history = generate_history(equipment_rates, user_ids, admin_id, years, rentals_per_day, random.Random(seed))
+    for item in history:
+        batch.append(item)
+        if len(batch) == batch_size:
+            created += await insert_history_batch(db_session, batch)
+            await db_session.commit()
+            batch = []
+    if batch:
+        created += await insert_history_batch(db_session, batch)
+    return created
+
+
+async def seed_synthetic_data(equipment_count: int, user_count: int, years: int = 1,
+                              rentals_per_day: int = 20, seed: int = 42, batch_size: int = BULK_BATCH_SIZE):
+    """Основная функция заполнения синтетическими данными."""
+    print(f"🚀 Синтетический набор: {equipment_count} единиц оборудования, {user_count} пользователей, "
+          f"история аренд за {years} г. ({rentals_per_day} в день)")
+    db_session = AsyncSessionLocal()
+    started = time.perf_counter()
+
+    try:
+        await bulk_create_brand_systems(db_session, batch_size=batch_size)
+        await bulk_create_accessories(db_session, batch_size=batch_size)
+
+        # Оборудование генерируется и записывается пачками, чтобы не держать весь каталог в памяти;
+        # существующие имена проверяются только среди имен текущей пачки
+        created_equipment = 0
+        batch = []
+        for equipment_data in generate_equipment(equipment_count):
+            batch.append(equipment_data)
+            if len(batch) == batch_size:
+                created_equipment += await create_equipment_batch(db_session, batch, batch_size)
+                await db_session.commit()
+                batch = []
+        if batch:
+            created_equipment += await create_equipment_batch(db_session, batch, batch_size)
+
+        created_users = await create_load_test_users(db_session, user_count, batch_size)
+        await db_session.commit()
+
+        created_history = 0
+        if years > 0:
+            created_history = await create_rental_history(db_session, years, rentals_per_day, seed, batch_size)
+            await db_session.commit()
+
+        elapsed = time.perf_counter() - started
+        print(f"✅ Создано оборудования: {created_equipment}, пользователей: {created_users}, "
+              f"аренд и резерваций: {created_history} за {elapsed:.2f} с")
+        print(f"🔑 Пароль пользователей: {LOAD_TEST_PASSWORD}")
+
+    except Exception as e:
+        await db_session.rollback()
+        print(f"❌ Произошла ошибка: {e}")
+        raise
+    finally:
+        await db_session.close()
+        print("🏁 Скрипт завершил работу.")
+
+
+def parse_args():
+    """Разбирает аргументы командной строки."""
+    parser = argparse.ArgumentParser(description="Синтетические данные для нагрузочного тестирования")
+    parser.add_argument("--equipment", type=int, default=10000, help="количество единиц оборудования")
+    parser.add_argument("--users", type=int, default=200, help="количество пользователей")
+    parser.add_argument("--years", type=int, default=1, help="глубина истории аренд в годах (0 - без истории)")
+    parser.add_argument("--rentals-per-day", type=int, default=20, help="количество аренд, начинающихся в день")
+    parser.add_argument("--seed", type=int, default=42, help="зерно генератора для воспроизводимой истории")
+    parser.add_argument("--batch-size", type=int, default=BULK_BATCH_SIZE, help="размер пачки")
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    asyncio.run(seed_synthetic_data(args.equipment, args.users, args.years, args.rentals_per_day,
+                                    args.seed, args.batch_size))
@@ -0,0 +1,223 @@
+#!/bin/bash
+
+# Скрипт для быстрого создания бэкапа базы данных PostgreSQL в Docker
+# Формат directory: pg_dump выгружает таблицы в несколько потоков, файлы данных
+# сжимаются zstd параллельно, для всех файлов сохраняются контрольные суммы SHA-256.
+# Режим --base создает базовую копию кластера (pg_basebackup) для восстановления
+# на момент времени по архиву WAL (см. docker-compose.wal-archive.yml)
+
+set -e  # Выход при любой ошибке
+
+# Цвета для вывода
+RED='\033[0;31m'
+GREEN='\033[0;32m'
+YELLOW='\033[1;33m'
+BLUE='\033[0;34m'
+NC='\033[0m' # No Color
+
+# Функция для логирования
+log() {
+    echo -e "${BLUE}[$(date +'%Y-%m-%d %H:%M:%S')]${NC} $1"
+}
+
+error() {
+    echo -e "${RED}[ERROR]${NC} $1" >&2
+}
+
+success() {
+    echo -e "${GREEN}[SUCCESS]${NC} $1"
+}
+
+warning() {
+    echo -e "${YELLOW}[WARNING]${NC} $1"
+}
+
+usage() {
+    echo "Использование: $0 [--base] [--jobs N] [--zstd-level N] [--keep-days N]"
+    echo
+    echo "  --base          базовая копия кластера для восстановления на момент времени (PITR)"
+    echo "  --jobs N        количество параллельных потоков (по умолчанию: число ядер)"
+    echo "  --zstd-level N  уровень сжатия zstd (по умолчанию: 3)"
+    echo "  --keep-days N   удалить бэкапы старше N дней после успешного создания"
+}
+
+# Разбираем аргументы
+MODE="dump"
+JOBS=$(nproc 2>/dev/null || echo 2)
+ZSTD_LEVEL=3
+KEEP_DAYS=""
+
+while [ $# -gt 0 ]; do
+    case "$1" in
+        --base) MODE="base"; shift ;;
+        --jobs|-j) JOBS="$2"; shift 2 ;;
+        --zstd-level) ZSTD_LEVEL="$2"; shift 2 ;;
+        --keep-days) KEEP_DAYS="$2"; shift 2 ;;
+        -h|--help) usage; exit 0 ;;
+        *) error "Неизвестный параметр: $1"; usage; exit 1 ;;
+    esac
+done
+
+# Проверяем наличие .env файла
+if [ ! -f ".env" ]; then
+    error "Файл .env не найден! Создайте его на основе env.example"
+    exit 1
+fi
+
+# Загружаем переменные окружения
+source .env
+
+# Проверяем обязательные переменные
+if [ -z "$POSTGRES_USER" ] || [ -z "$POSTGRES_PASSWORD" ] || [ -z "$POSTGRES_DB" ]; then
+    error "Не все переменные базы данных заданы в .env файле"
+    exit 1
+fi
+
+if ! command -v zstd >/dev/null 2>&1; then
+    error "Утилита zstd не найдена! Установите ее: sudo apt install zstd"
+    exit 1
+fi
+
+# Создаем директорию для бэкапов если её нет
+BACKUP_DIR="db_backup"
+mkdir -p "$BACKUP_DIR"
+
+TIMESTAMP=$(date +"%Y%m%d_%H%M%S")
+BACKUP_NAME="rental_db_${MODE}_$TIMESTAMP"
+BACKUP_PATH="$BACKUP_DIR/$BACKUP_NAME"
+CONTAINER_TMP="/tmp/$BACKUP_NAME"
+
+log "Начинаем создание бэкапа базы данных (режим: $MODE, потоков: $JOBS)..."
+
+# Проверяем, что контейнер базы данных запущен
+if ! docker-compose ps db | grep -q "Up"; then
+    error "Контейнер базы данных не запущен! Запустите: docker-compose up -d db"
+    exit 1
+fi
+
+# Ждем готовности базы данных
+log "Ожидаем готовности базы данных..."
+timeout=60
+while [ $timeout -gt 0 ]; do
+    if docker-compose exec -T db pg_isready -U "$POSTGRES_USER" -d "$POSTGRES_DB" >/dev/null 2>&1; then
+        break
+    fi
+    sleep 1
+    timeout=$((timeout-1))
+done
+
+if [ $timeout -eq 0 ]; then
+    error "База данных не готова к работе"
+    exit 1
+fi
+
+START_TIME=$(date +%s)
+
+if [ "$MODE" = "dump" ]; then
+    log "Выгружаем базу данных в формате directory ($JOBS потоков)..."
+    # Сжатие pg_dump отключено: файлы данных сжимаются zstd на хосте
+    docker-compose exec -T db pg_dump \
+        --username="$POSTGRES_USER" \
+        --dbname="$POSTGRES_DB" \
+        --format=directory \
+        --jobs="$JOBS" \
+        --compress=0 \
+        --encoding=UTF8 \
+        --no-password \
+        --file="$CONTAINER_TMP"
+else
+    ARCHIVE_MODE=$(docker-compose exec -T db psql -U "$POSTGRES_USER" -d "$POSTGRES_DB" -t -A -c "SHOW archive_mode;" | tr -d '\r')
+    if [ "$ARCHIVE_MODE" != "on" ]; then
+        warning "Архивация WAL выключена: бэкап восстановится только на момент создания"
+        warning "Для восстановления на момент времени запустите БД с docker-compose.wal-archive.yml"
+    fi
+
+    log "Создаем базовую копию кластера..."
+    docker-compose exec -T db pg_basebackup \
+        --username="$POSTGRES_USER" \
+        --pgdata="$CONTAINER_TMP" \
+        --format=tar \
+        --wal-method=stream \
+        --checkpoint=fast \
+        --label="$BACKUP_NAME" \
+        --no-password
+fi
+
+# Копируем бэкап из контейнера и удаляем временные файлы
+docker cp "$(docker-compose ps -q db):$CONTAINER_TMP" "$BACKUP_PATH"
+docker-compose exec -T db rm -rf "$CONTAINER_TMP"
+
+DUMP_TIME=$(date +%s)
+RAW_SIZE=$(du -sh "$BACKUP_PATH" | cut -f1)
+
+if [ "$MODE" = "base" ]; then
+    # Запоминаем первый сегмент WAL бэкапа: по нему очищается архив WAL при удалении старых бэкапов
+    tar -xOf "$BACKUP_PATH/base.tar" backup_label \
+        | sed -n 's/^START WAL LOCATION: .*(file \([0-9A-F]*\))$/\1/p' > "$BACKUP_PATH/wal_start"
+fi
+
+# Сжимаем файлы параллельно. toc.dat остается несжатым - его читает pg_restore
+log "Сжимаем бэкап zstd (уровень $ZSTD_LEVEL)..."
+find "$BACKUP_PATH" -type f \( -name '[0-9]*.dat' -o -name '*.tar' \) -print0 \
+    | xargs -0 -r -P "$JOBS" -n 1 zstd -q --rm -"$ZSTD_LEVEL"
+
+COMPRESS_TIME=$(date +%s)
+
+# Сохраняем контрольные суммы всех файлов бэкапа
+log "Вычисляем контрольные суммы..."
+(cd "$BACKUP_PATH" && find . -type f ! -name SHA256SUMS -printf '%P\n' | sort | xargs -r sha256sum > SHA256SUMS)
+
+END_TIME=$(date +%s)
+FILE_SIZE=$(du -sh "$BACKUP_PATH" | cut -f1)
+
+success "Бэкап успешно создан: $BACKUP_PATH (размер: $FILE_SIZE, до сжатия: $RAW_SIZE)"
+log "Время: выгрузка $((DUMP_TIME - START_TIME)) с, сжатие $((COMPRESS_TIME - DUMP_TIME)) с, всего $((END_TIME - START_TIME)) с"
+
+# Создаем файл с информацией о бэкапе
+INFO_FILE="$BACKUP_DIR/backup_info_$TIMESTAMP.txt"
+cat > "$INFO_FILE" << EOF
+=== ИНФОРМАЦИЯ О БЭКАПЕ БАЗЫ ДАННЫХ ===
+
+Дата создания: $(date)
+Каталог: $BACKUP_PATH
+Режим: $MODE
+Размер: $FILE_SIZE (до сжатия: $RAW_SIZE)
+База данных: $POSTGRES_DB
+Пользователь: $POSTGRES_USER
+Потоков: $JOBS
+Сжатие: zstd уровень $ZSTD_LEVEL
+
+=== ВРЕМЯ ВЫПОЛНЕНИЯ ===
+Выгрузка: $((DUMP_TIME - START_TIME)) с
+Сжатие: $((COMPRESS_TIME - DUMP_TIME)) с
+Всего: $((END_TIME - START_TIME)) с
+
+=== КОМАНДА ВОССТАНОВЛЕНИЯ ===
+./scripts/restore_database_fast.sh $BACKUP_PATH
+
+=== ПРОВЕРКА ЦЕЛОСТНОСТИ ===
+(cd $BACKUP_PATH && sha256sum -c SHA256SUMS)
+EOF
+
+log "Информация о бэкапе сохранена в: $INFO_FILE"
+
+# Удаляем бэкапы старше срока хранения
+if [ -n "$KEEP_DAYS" ]; then
+    log "Удаляем бэкапы старше $KEEP_DAYS дней..."
+    find "$BACKUP_DIR" -maxdepth 1 -type d \( -name 'rental_db_dump_*' -o -name 'rental_db_base_*' \) \
+        -mtime +"$KEEP_DAYS" -print -exec rm -rf {} +
+    find "$BACKUP_DIR" -maxdepth 1 -type f -name 'backup_info_*.txt' -mtime +"$KEEP_DAYS" -print -delete
+
+    # Сегменты WAL старше самой ранней оставшейся базовой копии больше не нужны
+    OLDEST_BASE=$(find "$BACKUP_DIR" -maxdepth 1 -type d -name 'rental_db_base_*' | sort | head -n 1)
+    if [ -n "$OLDEST_BASE" ] && [ -s "$OLDEST_BASE/wal_start" ] && [ -d "$BACKUP_DIR/wal" ]; then
+        log "Очищаем архив WAL до сегмента $(cat "$OLDEST_BASE/wal_start")..."
+        docker-compose exec -T db pg_archivecleanup /backups/wal "$(cat "$OLDEST_BASE/wal_start")"
+    fi
+fi
+
+# Показываем список всех бэкапов
+log "Доступные бэкапы:"
+du -sh "$BACKUP_DIR"/rental_db_dump_* "$BACKUP_DIR"/rental_db_base_* 2>/dev/null || warning "Бэкапы не найдены"
+
+success "Процесс бэкапа завершен успешно!"
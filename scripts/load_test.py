@@ -0,0 +1,277 @@
+#!/usr/bin/env python3
+"""
+Нагрузочный тест горячих путей API: каталог, календарь доступности,
+создание резерваций и сводка дашборда. Запросы выполняются конкурентно,
+по каждому сценарию выводятся пропускная способность и задержки p50/p95/p99.
+Результаты сохраняются как базовая линия, а повторный прогон с --compare
+завершается с ошибкой при деградации относительно нее. Созданные за прогон
+резервации удаляются по его завершении.
+
+Подготовка данных: python deploy/seed_synthetic_data.py --equipment 10000 --users 200 --years 2
+Зависимости: pip install httpx
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import sys
+import time
+from datetime import date, timedelta
+from typing import Dict, List, Tuple
+
+import httpx
+
+LOAD_TEST_EMAIL_TEMPLATE = "loadtest_{index:06d}@rentalapp.com"
+LOAD_TEST_PASSWORD = "LoadTest2024!"
+ADMIN_EMAIL = "admin@rentalapp.com"
+ADMIN_PASSWORD = "AdminRental2024!"
+
+# Доли сценариев в общем потоке запросов
+SCENARIO_WEIGHTS = {
+    "catalog": 50,
+    "calendar": 30,
+    "reservation": 15,
+    "dashboard": 5,
+}
+
+# Фрагменты detail ответа 400 на создание резервации, означающие занятость оборудования.
+# Остальные отказы (праздник, нерабочий день, ошибка валидации) считаются ошибками
+CONFLICT_DETAIL_MARKERS = ("недоступ", "занят", "забронир", "пересека", "конфликт")
+
+
+def percentile(sorted_values: List[float], percent: float) -> float:
+    """Перцентиль по методу ближайшего ранга для отсортированного списка."""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, int(round(percent / 100 * len(sorted_values))))
+    return sorted_values[min(rank, len(sorted_values)) - 1]
+
+
+def is_booking_conflict(response: httpx.Response) -> bool:
+    """Ответ на создание резервации - конфликт бронирования: 409 или 400 о занятости оборудования."""
+    if response.status_code == 409:
+        return True
+    if response.status_code != 400:
+        return False
+    try:
+        body = response.json()
+    except ValueError:
+        return False
+    detail = body.get("detail") if isinstance(body, dict) else None
+    return isinstance(detail, str) and any(marker in detail.lower() for marker in CONFLICT_DETAIL_MARKERS)
+
+
+def random_window(max_days: int = 7):
+    """Случайный период аренды в ближайшие 90 дней."""
+    start = date.today() + timedelta(days=random.randint(1, 90))
+    return start, start + timedelta(days=random.randint(1, max_days))
+
+
+async def login(client: httpx.AsyncClient, email: str, password: str) -> Dict[str, str]:
+    """Получает JWT токен и возвращает заголовки авторизации."""
+    response = await client.post("/auth/token", data={"username": email, "password": password})
+    response.raise_for_status()
+    return {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+
+class LoadTest:
+    """Конкурентный прогон сценариев с накоплением задержек по каждому из них."""
+
+    def __init__(self, client: httpx.AsyncClient, equipment_ids: List[int],
+                 user_headers: List[Dict[str, str]], admin_headers: Dict[str, str]):
+        self.client = client
+        self.equipment_ids = equipment_ids
+        self.user_headers = user_headers
+        self.admin_headers = admin_headers
+        self.latencies: Dict[str, List[float]] = {name: [] for name in SCENARIO_WEIGHTS}
+        self.errors: Dict[str, int] = {name: 0 for name in SCENARIO_WEIGHTS}
+        self.conflicts = 0
+        self.created_reservations: List[Tuple[int, Dict[str, str]]] = []
+        self.reservation_checked = False
+        self.abort_reason = ""
+
+    async def catalog(self):
+        params = {"skip": random.randint(0, 200), "limit": 20}
+        if random.random() < 0.5:
+            start, end = random_window()
+            params.update(available_only="true", start_date=start.isoformat(), end_date=end.isoformat())
+        return await self.client.get("/equipment/", params=params)
+
+    async def calendar(self):
+        start, end = random_window(30)
+        ids = random.sample(self.equipment_ids, min(10, len(self.equipment_ids)))
+        params = [("start", start.isoformat()), ("end", end.isoformat())] + [("ids", i) for i in ids]
+        return await self.client.get("/calendar/view", params=params)
+
+    async def reservation(self):
+        start, end = random_window()
+        payload = {
+            "start_date": start.isoformat(),
+            "end_date": end.isoformat(),
+            "equipment_ids": random.sample(self.equipment_ids, min(2, len(self.equipment_ids))),
+            "accessory_ids": [],
+            "notes": "Нагрузочный тест"
+        }
+        headers = random.choice(self.user_headers)
+        response = await self.client.post("/reservations/", json=payload, headers=headers)
+        if response.is_success:
+            self.created_reservations.append((response.json()["id"], headers))
+        return response
+
+    async def dashboard(self):
+        return await self.client.get("/admin/dashboard/summary", headers=self.admin_headers)
+
+    async def worker(self, deadline: float):
+        names = list(SCENARIO_WEIGHTS)
+        weights = list(SCENARIO_WEIGHTS.values())
+        while time.perf_counter() < deadline and not self.abort_reason:
+            name = random.choices(names, weights)[0]
+            started = time.perf_counter()
+            try:
+                response = await getattr(self, name)()
+            except httpx.HTTPError:
+                self.errors[name] += 1
+                continue
+            elapsed_ms = (time.perf_counter() - started) * 1000
+            if name == "reservation" and not self.reservation_checked:
+                self.reservation_checked = True
+                if response.status_code == 403:
+                    self.abort_reason = ("POST /reservations/ вернул 403 - передайте --csrf-token "
+                                         "или запустите backend с DISABLE_CSRF=true")
+                    return
+            # Успех - только 2xx; конфликт бронирования - ожидаемый исход при конкурентной нагрузке,
+            # он учитывается отдельно и не попадает в задержки успешных запросов
+            if response.is_success:
+                self.latencies[name].append(elapsed_ms)
+            elif name == "reservation" and is_booking_conflict(response):
+                self.conflicts += 1
+            else:
+                self.errors[name] += 1
+
+    async def run(self, concurrency: int, duration: float) -> Dict[str, Dict[str, float]]:
+        deadline = time.perf_counter() + duration
+        await asyncio.gather(*(self.worker(deadline) for _ in range(concurrency)))
+
+        report = {}
+        for name, values in self.latencies.items():
+            values.sort()
+            report[name] = {
+                "requests": len(values),
+                "errors": self.errors[name],
+                "rps": round(len(values) / duration, 2),
+                "p50_ms": round(percentile(values, 50), 2),
+                "p95_ms": round(percentile(values, 95), 2),
+                "p99_ms": round(percentile(values, 99), 2),
+            }
+        return report
+
+    async def cleanup(self, concurrency: int) -> int:
+        """Удаляет созданные за прогон резервации. Возвращает количество удаленных."""
+        async def delete(reservation_id: int, headers: Dict[str, str]) -> bool:
+            try:
+                response = await self.client.delete(f"/reservations/{reservation_id}", headers=headers)
+            except httpx.HTTPError:
+                return False
+            return response.is_success
+
+        deleted = 0
+        for start in range(0, len(self.created_reservations), concurrency):
+            batch = self.created_reservations[start:start + concurrency]
+            deleted += sum(await asyncio.gather(*(delete(*item) for item in batch)))
+        return deleted
+
+
+def print_report(report: Dict[str, Dict[str, float]], conflicts: int):
+    """Выводит таблицу результатов."""
+    print(f"\n{'Сценарий':<14}{'запросов':>10}{'ошибок':>8}{'rps':>10}{'p50 мс':>10}{'p95 мс':>10}{'p99 мс':>10}")
+    for name, stats in report.items():
+        print(f"{name:<14}{stats['requests']:>10}{stats['errors']:>8}{stats['rps']:>10}"
+              f"{stats['p50_ms']:>10}{stats['p95_ms']:>10}{stats['p99_ms']:>10}")
+    print(f"\nКонфликтов бронирования: {conflicts}")
+
+
+def compare_with_baseline(report: Dict[str, Dict[str, float]], baseline: Dict[str, Dict[str, float]],
+                          tolerance: float) -> bool:
+    """Сравнивает прогон с базовой линией. Возвращает False при деградации больше tolerance процентов."""
+    ok = True
+    for name, stats in report.items():
+        base = baseline.get(name)
+        if not base or not base["requests"]:
+            continue
+        for metric in ("p95_ms", "p99_ms"):
+            if base[metric] and stats[metric] > base[metric] * (1 + tolerance / 100):
+                print(f"❌ {name}: {metric} {stats[metric]} > {base[metric]} (+{tolerance}%)")
+                ok = False
+        if stats["rps"] < base["rps"] * (1 - tolerance / 100):
+            print(f"❌ {name}: rps {stats['rps']} < {base['rps']} (-{tolerance}%)")
+            ok = False
+        if stats["errors"] > base["errors"]:
+            print(f"❌ {name}: ошибок {stats['errors']} > {base['errors']}")
+            ok = False
+    return ok
+
+
+async def main(args) -> bool:
+    limits = httpx.Limits(max_connections=args.concurrency, max_keepalive_connections=args.concurrency)
+    headers = {"X-CSRF-Token": args.csrf_token} if args.csrf_token else {}
+    async with httpx.AsyncClient(base_url=args.base_url, limits=limits, headers=headers, timeout=30) as client:
+        catalog = await client.get("/equipment/", params={"limit": 500})
+        catalog.raise_for_status()
+        equipment_ids = [item["id"] for item in catalog.json()["items"] if item.get("entity_type", "equipment") == "equipment"]
+        if not equipment_ids:
+            print("❌ Каталог пуст - запустите deploy/seed_synthetic_data.py")
+            return False
+
+        user_headers = await asyncio.gather(*(
+            login(client, LOAD_TEST_EMAIL_TEMPLATE.format(index=index), LOAD_TEST_PASSWORD)
+            for index in range(1, args.users + 1)
+        ))
+        admin_headers = await login(client, ADMIN_EMAIL, ADMIN_PASSWORD)
+
+        print(f"🚀 Нагрузка: {args.concurrency} конкурентных клиентов, {args.duration} с, "
+              f"{len(equipment_ids)} единиц оборудования, {args.users} пользователей")
+        load_test = LoadTest(client, equipment_ids, list(user_headers), admin_headers)
+        report = await load_test.run(args.concurrency, args.duration)
+
+        deleted = await load_test.cleanup(args.concurrency)
+        print(f"🧹 Удалено резерваций прогона: {deleted}/{len(load_test.created_reservations)}")
+
+    if load_test.abort_reason:
+        print(f"❌ Прогон прерван: {load_test.abort_reason}")
+        return False
+
+    print_report(report, load_test.conflicts)
+
+    if args.save_baseline:
+        with open(args.save_baseline, "w", encoding="utf-8") as baseline_file:
+            json.dump(report, baseline_file, ensure_ascii=False, indent=2)
+        print(f"💾 Базовая линия сохранена: {args.save_baseline}")
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as baseline_file:
+            baseline = json.load(baseline_file)
+        if not compare_with_baseline(report, baseline, args.tolerance):
+            print("❌ Обнаружена деградация производительности")
+            return False
+        print("✅ Деградации относительно базовой линии нет")
+    return True
+
+
+def parse_args():
+    """Разбирает аргументы командной строки."""
+    parser = argparse.ArgumentParser(description="Нагрузочный тест горячих путей API")
+    parser.add_argument("--base-url", default="http://localhost:8000/api", help="базовый URL API")
+    parser.add_argument("--concurrency", type=int, default=20, help="количество конкурентных клиентов")
+    parser.add_argument("--duration", type=float, default=60, help="длительность прогона, с")
+    parser.add_argument("--users", type=int, default=20,
+                        help="сколько пользователей из seed_synthetic_data.py использовать для резерваций")
+    parser.add_argument("--csrf-token", help="CSRF токен для POST запросов (не нужен при DISABLE_CSRF=true)")
+    parser.add_argument("--save-baseline", help="сохранить результаты в JSON файл базовой линии")
+    parser.add_argument("--compare", help="сравнить с JSON файлом базовой линии")
+    parser.add_argument("--tolerance", type=float, default=20, help="допустимая деградация, %%")
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    sys.exit(0 if asyncio.run(main(parse_args())) else 1)
@@ -0,0 +1,288 @@
+#!/bin/bash
+
+# Скрипт для быстрого восстановления базы данных PostgreSQL в Docker
+# из бэкапа, созданного scripts/backup_database_fast.sh
+# Бэкап формата directory восстанавливается pg_restore в несколько потоков
+# (данные и индексы строятся параллельно); базовая копия кластера
+# восстанавливается с догоном по архиву WAL, опционально на момент времени
+
+set -e  # Выход при любой ошибке
+
+# Цвета для вывода
+RED='\033[0;31m'
+GREEN='\033[0;32m'
+YELLOW='\033[1;33m'
+BLUE='\033[0;34m'
+NC='\033[0m' # No Color
+
+# Функция для логирования
+log() {
+    echo -e "${BLUE}[$(date +'%Y-%m-%d %H:%M:%S')]${NC} $1"
+}
+
+error() {
+    echo -e "${RED}[ERROR]${NC} $1" >&2
+}
+
+success() {
+    echo -e "${GREEN}[SUCCESS]${NC} $1"
+}
+
+warning() {
+    echo -e "${YELLOW}[WARNING]${NC} $1"
+}
+
+usage() {
+    error "Использование: $0 <каталог_бэкапа> [--jobs N] [--maintenance-work-mem SIZE] [--target-time 'YYYY-MM-DD HH:MM:SS+HH'] [--recovery-timeout N] [--yes]"
+    error "  --jobs N                     параллельных потоков pg_restore (по умолчанию: 2)"
+    error "  --maintenance-work-mem SIZE  память на построение индекса в каждом потоке, например 256MB"
+    error "                               (по умолчанию - настройка сервера)"
+    error "  --target-time TIME           момент восстановления с явным смещением часового пояса"
+    error "  --recovery-timeout N         предельное время применения архива WAL, с (по умолчанию: 3600)"
+    error "Пример: $0 db_backup/rental_db_dump_20241201_120000"
+    error "Пример: $0 db_backup/rental_db_base_20241201_120000 --target-time '2024-12-01 15:30:00+04'"
+}
+
+wait_for_db() {
+    timeout=120
+    while [ $timeout -gt 0 ]; do
+        if docker-compose exec -T db pg_isready -U "$POSTGRES_USER" -d postgres >/dev/null 2>&1; then
+            return 0
+        fi
+        sleep 1
+        timeout=$((timeout-1))
+    done
+    error "База данных не готова к работе"
+    exit 1
+}
+
+# Проверяем аргументы
+if [ $# -eq 0 ]; then
+    usage
+    exit 1
+fi
+
+BACKUP_PATH="${1%/}"
+shift
+# Количество потоков по умолчанию невелико: число ядер хоста не отражает лимиты контейнера БД
+# (docker-compose.limited-resources.yml - 0.4 CPU и 512M), а каждый поток строит индексы отдельно
+JOBS=2
+TARGET_TIME=""
+ASSUME_YES=""
+# Память на построение одного индекса; умножается на количество потоков.
+# Пусто - используется настройка сервера (maintenance_work_mem из docker-compose)
+MAINTENANCE_WORK_MEM=""
+RECOVERY_TIMEOUT=3600
+
+while [ $# -gt 0 ]; do
+    case "$1" in
+        --jobs|-j) JOBS="$2"; shift 2 ;;
+        --target-time) TARGET_TIME="$2"; shift 2 ;;
+        --maintenance-work-mem) MAINTENANCE_WORK_MEM="$2"; shift 2 ;;
+        --recovery-timeout) RECOVERY_TIMEOUT="$2"; shift 2 ;;
+        --yes) ASSUME_YES="yes"; shift ;;
+        *) error "Неизвестный параметр: $1"; usage; exit 1 ;;
+    esac
+done
+
+# Проверяем наличие каталога бэкапа
+if [ ! -d "$BACKUP_PATH" ]; then
+    error "Каталог бэкапа не найден: $BACKUP_PATH"
+    exit 1
+fi
+
+if [ -f "$BACKUP_PATH/toc.dat" ]; then
+    MODE="dump"
+elif ls "$BACKUP_PATH"/base.tar* >/dev/null 2>&1; then
+    MODE="base"
+else
+    error "Каталог не похож на бэкап backup_database_fast.sh: $BACKUP_PATH"
+    exit 1
+fi
+
+if [ "$MODE" = "dump" ] && [ -n "$TARGET_TIME" ]; then
+    error "--target-time поддерживается только для базовой копии кластера (backup_database_fast.sh --base)"
+    exit 1
+fi
+
+# Без смещения PostgreSQL трактует время в часовом поясе контейнера (UTC), а backend работает
+# в Europe/Astrakhan - точка восстановления сместилась бы на несколько часов
+if [ -n "$TARGET_TIME" ] && ! echo "$TARGET_TIME" | grep -Eq '([+-][0-9]{2}(:?[0-9]{2})?|Z|UTC)$'; then
+    error "В --target-time укажите смещение часового пояса, например '2024-12-01 15:30:00+04' или '... 11:30:00+00'"
+    exit 1
+fi
+
+# Проверяем наличие .env файла
+if [ ! -f ".env" ]; then
+    error "Файл .env не найден! Создайте его на основе env.example"
+    exit 1
+fi
+
+# Загружаем переменные окружения
+source .env
+
+# Проверяем обязательные переменные
+if [ -z "$POSTGRES_USER" ] || [ -z "$POSTGRES_PASSWORD" ] || [ -z "$POSTGRES_DB" ]; then
+    error "Не все переменные базы данных заданы в .env файле"
+    exit 1
+fi
+
+if ! command -v zstd >/dev/null 2>&1; then
+    error "Утилита zstd не найдена! Установите ее: sudo apt install zstd"
+    exit 1
+fi
+
+START_TIME=$(date +%s)
+
+# Проверяем целостность бэкапа
+log "Проверяем контрольные суммы бэкапа..."
+if [ ! -f "$BACKUP_PATH/SHA256SUMS" ]; then
+    error "Файл контрольных сумм не найден: $BACKUP_PATH/SHA256SUMS"
+    exit 1
+fi
+if ! (cd "$BACKUP_PATH" && sha256sum --quiet -c SHA256SUMS); then
+    error "Контрольные суммы не совпадают - бэкап поврежден!"
+    exit 1
+fi
+success "Контрольные суммы совпадают"
+
+# Распаковываем во временный каталог внутри db_backup: он смонтирован в контейнер как /backups
+TEMP_NAME=".restore_$$"
+TEMP_DIR="db_backup/$TEMP_NAME"
+trap 'rm -rf "$TEMP_DIR"' EXIT
+mkdir -p "$TEMP_DIR"
+cp -r "$BACKUP_PATH"/. "$TEMP_DIR"/
+log "Распаковываем бэкап ($JOBS потоков)..."
+find "$TEMP_DIR" -type f -name '*.zst' -print0 | xargs -0 -r -P "$JOBS" -n 1 zstd -q -d --rm
+chmod -R a+rX "$TEMP_DIR"
+
+DECOMPRESS_TIME=$(date +%s)
+
+warning "Восстановление удалит все текущие данные базы данных '$POSTGRES_DB'!"
+if [ "$ASSUME_YES" != "yes" ]; then
+    read -p "Введите 'yes' для подтверждения: " confirm
+    if [ "$confirm" != "yes" ]; then
+        log "Операция отменена пользователем"
+        exit 0
+    fi
+fi
+
+if [ "$MODE" = "dump" ]; then
+    # Проверяем, что контейнер базы данных запущен
+    if ! docker-compose ps db | grep -q "Up"; then
+        error "Контейнер базы данных не запущен! Запустите: docker-compose up -d db"
+        exit 1
+    fi
+
+    log "Ожидаем готовности базы данных..."
+    wait_for_db
+
+    log "Пересоздаем базу данных..."
+    docker-compose exec -T db psql -U "$POSTGRES_USER" -d postgres -c "DROP DATABASE IF EXISTS \"$POSTGRES_DB\" WITH (FORCE);"
+    docker-compose exec -T db psql -U "$POSTGRES_USER" -d postgres -c "CREATE DATABASE \"$POSTGRES_DB\" ENCODING 'UTF8' TEMPLATE template0;"
+
+    PG_ENV=()
+    if [ -n "$MAINTENANCE_WORK_MEM" ]; then
+        PG_ENV=(-e PGOPTIONS="-c maintenance_work_mem=$MAINTENANCE_WORK_MEM")
+    fi
+
+    log "Восстанавливаем базу данных ($JOBS потоков)..."
+    docker-compose exec -T "${PG_ENV[@]}" db pg_restore \
+        --username="$POSTGRES_USER" \
+        --dbname="$POSTGRES_DB" \
+        --format=directory \
+        --jobs="$JOBS" \
+        --exit-on-error \
+        --no-password \
+        "/backups/$TEMP_NAME"
+
+    # pg_restore не переносит статистику планировщика - собираем ее заново
+    log "Обновляем статистику планировщика..."
+    docker-compose exec -T db vacuumdb --username="$POSTGRES_USER" --dbname="$POSTGRES_DB" \
+        --analyze-only --jobs="$JOBS" --quiet
+else
+    log "Останавливаем backend и базу данных..."
+    docker-compose stop backend db
+
+    RECOVERY_SETTINGS="restore_command = 'cp /backups/wal/%f %p'"
+    if [ -n "$TARGET_TIME" ]; then
+        log "Точка восстановления: $TARGET_TIME"
+        RECOVERY_SETTINGS="$RECOVERY_SETTINGS
+recovery_target_time = '$TARGET_TIME'
+recovery_target_action = 'promote'"
+    fi
+
+    echo "$RECOVERY_SETTINGS" > "$TEMP_DIR/recovery.conf"
+
+    log "Заменяем каталог данных кластера базовой копией..."
+    docker-compose run --rm --no-deps -T --entrypoint sh db -c "
+        set -e
+        find \"\$PGDATA\" -mindepth 1 -delete
+        tar -xf /backups/$TEMP_NAME/base.tar -C \"\$PGDATA\"
+        if [ -f /backups/$TEMP_NAME/pg_wal.tar ]; then
+            tar -xf /backups/$TEMP_NAME/pg_wal.tar -C \"\$PGDATA/pg_wal\"
+        fi
+        cat /backups/$TEMP_NAME/recovery.conf >> \"\$PGDATA/postgresql.auto.conf\"
+        touch \"\$PGDATA/recovery.signal\"
+        chown -R postgres:postgres \"\$PGDATA\"
+        chmod 700 \"\$PGDATA\"
+    "
+
+    log "Запускаем базу данных и применяем архив WAL (не более $RECOVERY_TIMEOUT с)..."
+    docker-compose up -d db
+    # До согласованного состояния сервер отклоняет подключения, поэтому пустой ответ - не ошибка,
+    # пока контейнер работает; остановка контейнера означает FATAL при восстановлении
+    RECOVERY_STARTED=$(date +%s)
+    while true; do
+        IN_RECOVERY=$(docker-compose exec -T db psql -U "$POSTGRES_USER" -d postgres -t -A \
+            -c 'SELECT pg_is_in_recovery();' 2>/dev/null | tr -d '\r' || true)
+        if [ "$IN_RECOVERY" = "f" ]; then
+            break
+        fi
+        if [ -z "$IN_RECOVERY" ] && ! docker-compose ps db | grep -q "Up"; then
+            error "PostgreSQL остановился во время восстановления по архиву WAL"
+            error "Последние сообщения сервера:"
+            docker-compose logs --no-color --tail=20 db >&2
+            error "Если указан --target-time, проверьте, что он не раньше времени бэкапа и покрыт архивом WAL"
+            exit 1
+        fi
+        if [ $(( $(date +%s) - RECOVERY_STARTED )) -ge "$RECOVERY_TIMEOUT" ]; then
+            error "Восстановление по архиву WAL не завершилось за $RECOVERY_TIMEOUT с"
+            docker-compose logs --no-color --tail=20 db >&2
+            exit 1
+        fi
+        sleep 2
+    done
+    success "Архив WAL применен, кластер переведен в рабочий режим"
+    docker-compose up -d backend
+fi
+
+END_TIME=$(date +%s)
+
+# Проверяем, что база данных создана и содержит данные
+log "Проверяем восстановленную базу данных..."
+
+TABLE_COUNT=$(docker-compose exec -T db psql -U "$POSTGRES_USER" -d "$POSTGRES_DB" -t -c "SELECT COUNT(*) FROM information_schema.tables WHERE table_schema = 'public';" | xargs)
+INDEX_COUNT=$(docker-compose exec -T db psql -U "$POSTGRES_USER" -d "$POSTGRES_DB" -t -c "SELECT COUNT(*) FROM pg_indexes WHERE schemaname = 'public';" | xargs)
+
+if [ "$TABLE_COUNT" -gt 0 ]; then
+    success "База данных успешно восстановлена! Таблиц: $TABLE_COUNT, индексов: $INDEX_COUNT"
+else
+    error "База данных восстановлена, но таблицы не найдены!"
+    exit 1
+fi
+
+log "Время: распаковка $((DECOMPRESS_TIME - START_TIME)) с, восстановление $((END_TIME - DECOMPRESS_TIME)) с, всего $((END_TIME - START_TIME)) с"
+
+# Запускаем миграции Alembic для обновления схемы до актуального состояния
+log "Запускаем миграции базы данных..."
+if docker-compose ps backend | grep -q "Up"; then
+    docker-compose exec backend alembic upgrade head
+    success "Миграции выполнены успешно"
+else
+    warning "Backend контейнер не запущен. Запустите миграции вручную:"
+    warning "docker-compose exec backend alembic upgrade head"
+fi
+
+success "Процесс восстановления завершен успешно!"
+log "База данных готова к использованию"